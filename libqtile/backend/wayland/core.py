@@ -24,11 +24,13 @@ import asyncio
 import os
 import time
 import typing
+from collections import OrderedDict
 
 import wlroots.helper as wlroots_helper
 from pywayland import lib
 from pywayland.protocol.wayland import WlSeat
 from pywayland.server import Display
+from wlroots import ffi
 from wlroots.wlr_types import (
     Cursor,
     DataDeviceManager,
@@ -69,16 +71,21 @@ if typing.TYPE_CHECKING:
     from wlroots.wlr_types import Output as wlrOutput
 
     from libqtile import config, group
+    from libqtile.confreader import Config
     from libqtile.core.manager import Qtile
 
 
+# Layout options holding the border colours that layouts pass to Window.place()
+BORDER_COLOUR_OPTIONS = ("border_focus", "border_normal", "border_focus_stack", "border_normal_stack")
+
+
 class Core(base.Core, wlrq.HasListeners):
     def __init__(self):
         """Setup the Wayland core backend"""
         self.qtile: Optional[Qtile] = None
         self.desktops: int = 1
         self.current_desktop: int = 0
-        self.mapped_windows: List[window.WindowType] = []  # Ascending in Z
+        self.mapped_windows: OrderedDict[window.WindowType, None] = OrderedDict()  # Ascending in Z
 
         self.display = Display()
         self.event_loop = self.display.get_event_loop()
@@ -93,6 +100,7 @@ class Core(base.Core, wlrq.HasListeners):
         self.grabbed_buttons: List[Tuple[int, int]] = []
         self.device_manager = DataDeviceManager(self.display)
         self.seat = seat.Seat(self.display, "seat0")
+        self._focused_surface_ptr: Optional[ffi.CData] = None  # The keyboard focus
         self.add_listener(self.seat.request_set_selection_event, self._on_request_set_selection)
         self.add_listener(self.backend.new_input_event, self._on_new_input)
 
@@ -207,6 +215,7 @@ class Core(base.Core, wlrq.HasListeners):
             head.state.mode = output.wlr_output.current_mode
 
         self.output_manager.set_configuration(config)
+        self.invalidate_window_geometry()
 
     def _on_output_manager_apply(self, _listener, config: OutputConfigurationV1):
         logger.debug("Signal: output_manager apply_event")
@@ -367,9 +376,27 @@ class Core(base.Core, wlrq.HasListeners):
         """Setup a listener for the given qtile instance"""
         logger.debug("Adding io watch")
         self.qtile = qtile
+        self.precompute_theme_colors(qtile.config)
         self.fd = lib.wl_event_loop_get_fd(self.event_loop._ptr)
         asyncio.get_running_loop().add_reader(self.fd, self._poll)
 
+    def precompute_theme_colors(self, config: Config) -> None:
+        """Create the border colours used by the configured layouts ahead of first paint"""
+        layouts = list(config.layouts)
+        if config.floating_layout:
+            layouts.append(config.floating_layout)
+
+        for layout in layouts:
+            options = {option[0] for option in layout.defaults}
+            for name in BORDER_COLOUR_OPTIONS:
+                if name not in options:
+                    continue
+                try:
+                    window._rgb(getattr(layout, name))
+                except (TypeError, ValueError):
+                    # Not a colour we can paint; leave it for paint_borders to handle
+                    continue
+
     def remove_listener(self) -> None:
         """Remove the listener from the given event loop"""
         if self.fd is not None:
@@ -395,6 +422,7 @@ class Core(base.Core, wlrq.HasListeners):
         if previous_surface == surface:
             return
         self.seat.keyboard_clear_focus()
+        self._focused_surface_ptr = None
 
         if previous_surface is not None and previous_surface.is_xdg_surface:
             # Deactivate the previously focused surface
@@ -412,6 +440,7 @@ class Core(base.Core, wlrq.HasListeners):
         if surface.is_xdg_surface and isinstance(win.surface, XdgSurface):
             win.surface.set_activated(True)
         self.seat.keyboard_notify_enter(surface, self.seat.keyboard)
+        self._focused_surface_ptr = surface._ptr
 
     def focus_by_click(self, event) -> None:
         found = self._under_pointer()
@@ -522,6 +551,12 @@ class Core(base.Core, wlrq.HasListeners):
     def painter(self):
         return wlrq.Painter(self)
 
+    def invalidate_window_geometry(self) -> None:
+        """Make windows re-check which outputs they and their popups are on"""
+        for win in self.mapped_windows:
+            win._geom_dirty = True
+            win._popup_output_cache = None
+
     def output_from_wlr_output(self, wlr_output: wlrOutput) -> Output:
         matched = []
         for output in self.outputs:
@@ -21,6 +21,8 @@
 from __future__ import annotations
 
 import typing
+from collections import OrderedDict
+from itertools import chain
 
 from wlroots.util.clock import Timespec
 from wlroots.util.region import PixmanRegion32
@@ -54,6 +56,7 @@ class Output(HasListeners):
         wlr_output.data = self
         self.output_layout = self.core.output_layout
         self.damage: OutputDamage = OutputDamage(wlr_output)
+        self._damage_pending = False
         self.wallpaper = None
         self.transform_matrix = wlr_output.transform_matrix
         self.x, self.y = self.output_layout.output_coords(wlr_output)
@@ -61,11 +64,14 @@ class Output(HasListeners):
         self.add_listener(wlr_output.destroy_event, self._on_destroy)
         self.add_listener(self.damage.frame_event, self._on_frame)
 
-        # The layers enum indexes into this list to get a list of surfaces
-        self.layers: List[List[Static]] = [[]] * len(LayerShellV1Layer)
+        # The layers enum indexes into this list to get the surfaces in each layer
+        self.layers: List[OrderedDict[Static, None]] = [
+            OrderedDict() for _ in LayerShellV1Layer
+        ]
 
     def finalize(self):
         self.core.outputs.remove(self)
+        self.core.invalidate_window_geometry()
         self.finalize_listeners()
 
     def _on_destroy(self, _listener, _data):
@@ -73,6 +79,7 @@ class Output(HasListeners):
         self.finalize()
 
     def _on_frame(self, _listener, _data):
+        self._damage_pending = False
         wlr_output = self.wlr_output
 
         with PixmanRegion32() as damage:
@@ -95,11 +102,13 @@ class Output(HasListeners):
                 else:
                     renderer.clear([1, 0, 1, 1])
 
-                mapped = self.layers[LayerShellV1Layer.BACKGROUND] \
-                    + self.layers[LayerShellV1Layer.BOTTOM] \
-                    + self.core.mapped_windows \
-                    + self.layers[LayerShellV1Layer.TOP] \
-                    + self.layers[LayerShellV1Layer.OVERLAY]
+                mapped = chain(
+                    self.layers[LayerShellV1Layer.BACKGROUND],
+                    self.layers[LayerShellV1Layer.BOTTOM],
+                    self.core.mapped_windows,
+                    self.layers[LayerShellV1Layer.TOP],
+                    self.layers[LayerShellV1Layer.OVERLAY],
+                )
 
                 for window in mapped:
                     rdata = (
@@ -160,17 +169,27 @@ class Output(HasListeners):
         self.renderer.render_texture_with_matrix(texture, matrix, opacity)
         surface.send_frame_done(now)
 
+    def queue_damage(self) -> None:
+        """
+        Damage the whole output, unless it has already been damaged since the last
+        frame.
+        """
+        if not self._damage_pending:
+            self._damage_pending = True
+            self.damage.add_whole()
+
     def get_geometry(self) -> Tuple[int, int, int, int]:
         width, height = self.wlr_output.effective_resolution()
         return int(self.x), int(self.y), width, height
 
     def organise_layers(self) -> None:
         """Organise the positioning of layer shell surfaces."""
-        logger.info("Output: organising layers")
+        logger.debug("Output: organising layers")
         ow, oh = self.wlr_output.effective_resolution()
 
         for layer in self.layers:
-            for win in layer:
+            # Copy the layer, as killing a surface unmaps it and removes it from the layer
+            for win in list(layer):
                 assert isinstance(win.surface, LayerSurfaceV1)
                 state = win.surface.current
                 margin = state.margin
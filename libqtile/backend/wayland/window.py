@@ -20,7 +20,6 @@
 
 from __future__ import annotations
 
-import functools
 import typing
 
 import pywayland
@@ -42,29 +41,91 @@ from libqtile.command.base import CommandError
 from libqtile.log_utils import logger
 
 if typing.TYPE_CHECKING:
-    from typing import Dict, List, Optional, Tuple, Union
+    from typing import Callable, Dict, List, Optional, Tuple, Union
 
     from libqtile.backend.wayland.core import Core
     from libqtile.backend.wayland.output import Output
+    from libqtile.config import Screen
     from libqtile.core.manager import Qtile
 
 EDGES_TILED = Edges.TOP | Edges.BOTTOM | Edges.LEFT | Edges.RIGHT
 EDGES_FLOAT = Edges.NONE
 
 
-@functools.lru_cache()
+_RGB_CACHE: Dict[Union[str, Tuple], ffi.CData] = {}
+
+
 def _rgb(color: Union[str, List, Tuple]) -> ffi.CData:
     """Helper to create and cache float[4] arrays for border painting"""
     if isinstance(color, ffi.CData):
         return color
-    return ffi.new("float[4]", utils.rgb(color))
-
+    key = color if isinstance(color, str) else tuple(color)
+    rgb = _RGB_CACHE.get(key)
+    if rgb is None:
+        rgb = _RGB_CACHE[key] = ffi.new("float[4]", utils.rgb(color))
+    return rgb
+
+
+# Default border colour, shared by all windows
+_BLACK = _rgb((0, 0, 0, 1))
+
+# The geometry that a window takes on a screen in each of the floating states
+_STATE_RECT: Dict[FloatStates, Optional[Callable[[Screen, Window], Tuple[int, int, int, int]]]] = {
+    FloatStates.FLOATING: lambda screen, win: (
+        screen.x + win.float_x, screen.y + win.float_y, win.float_width, win.float_height
+    ),
+    FloatStates.MAXIMIZED: lambda screen, win: (
+        screen.dx, screen.dy, screen.dwidth, screen.dheight
+    ),
+    FloatStates.FULLSCREEN: lambda screen, win: (
+        screen.x, screen.y, screen.width, screen.height
+    ),
+    FloatStates.MINIMIZED: None,
+}
 
 # Window manages XdgSurfaces, Static manages XdgSurfaces and LayerSurfaceV1s
 SurfaceType = typing.Union[XdgSurface, LayerSurfaceV1]
 
 
 class Window(base.Window, HasListeners):
+    __slots__ = (
+        "core",
+        "qtile",
+        "surface",
+        "popups",
+        "_wid",
+        "_group",
+        "_mapped",
+        "_containing_outputs",
+        "_geom_dirty",
+        "_x",
+        "_y",
+        "_width",
+        "_height",
+        "bordercolor",
+        "borderwidth",
+        "_last_border",
+        "opacity",
+        "_float_state",
+        "float_x",
+        "float_y",
+        "float_width",
+        "float_height",
+        "_cached_screen",
+        "_cached_screen_rect",
+        "_cached_screens",
+        "_popup_output_cache",
+        "_popup_output_cache_key",
+    )
+    _LISTENERS: Tuple[Tuple[str, str], ...] = (
+        ("map_event", "_on_map"),
+        ("unmap_event", "_on_unmap"),
+        ("destroy_event", "_on_destroy"),
+        ("new_popup_event", "_on_new_popup"),
+        ("toplevel.request_fullscreen_event", "_on_request_fullscreen"),
+        ("surface.commit_event", "_on_commit"),
+    )
+
     def __init__(self, core: Core, qtile: Qtile, surface: SurfaceType, wid: int):
         base.Window.__init__(self)
         self.core = core
@@ -74,25 +135,30 @@ class Window(base.Window, HasListeners):
         self._wid = wid
         self._group = 0
         self._mapped: bool = False
+        self._containing_outputs: List[Output] = []
+        self._geom_dirty = True
         self.x = 0
         self.y = 0
-        self.bordercolor: ffi.CData = _rgb((0, 0, 0, 1))
+        self._width: int = 0
+        self._height: int = 0
+        self.bordercolor: ffi.CData = _BLACK
+        self._last_border: Optional[Tuple] = None
         self.opacity: float = 1.0
 
         assert isinstance(surface, XdgSurface)
         surface.set_tiled(EDGES_TILED)
         self._float_state = FloatStates.NOT_FLOATING
-        self.float_x = self.x
-        self.float_y = self.y
-        self.float_width = self.width
-        self.float_height = self.height
-
-        self.add_listener(surface.map_event, self._on_map)
-        self.add_listener(surface.unmap_event, self._on_unmap)
-        self.add_listener(surface.destroy_event, self._on_destroy)
-        self.add_listener(surface.new_popup_event, self._on_new_popup)
-        self.add_listener(surface.toplevel.request_fullscreen_event, self._on_request_fullscreen)
-        self.add_listener(surface.surface.commit_event, self._on_commit)
+        self.float_x: int = self.x
+        self.float_y: int = self.y
+        self.float_width: int = self.width
+        self.float_height: int = self.height
+        self._cached_screen: Optional[Screen] = None
+        self._cached_screen_rect: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._cached_screens: Optional[List[Screen]] = None
+        self._popup_output_cache: Optional[Tuple[float, float, Output]] = None
+        self._popup_output_cache_key: Optional[Tuple[int, int]] = None
+
+        self.add_listeners(surface, self._LISTENERS)
 
     def finalize(self):
         self.finalize_listeners()
@@ -101,13 +167,31 @@ class Window(base.Window, HasListeners):
     def wid(self):
         return self._wid
 
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @x.setter
+    def x(self, x: int) -> None:
+        self._x = x
+        self._geom_dirty = True
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @y.setter
+    def y(self, y: int) -> None:
+        self._y = y
+        self._geom_dirty = True
+
     @property
     def width(self):
-        return self.surface.surface.current.width
+        return self._width
 
     @property
     def height(self):
-        return self.surface.surface.current.height
+        return self._height
 
     @property
     def group(self):
@@ -125,35 +209,55 @@ class Window(base.Window, HasListeners):
     def mapped(self, mapped: bool) -> None:
         """We keep track of which windows are mapped to we know which to render"""
         self._mapped = mapped
+        self._geom_dirty = True
+        self._popup_output_cache = None
         if mapped:
-            if self not in self.core.mapped_windows:
-                self.core.mapped_windows.append(self)
+            self.core.mapped_windows[self] = None
         else:
-            if self in self.core.mapped_windows:
-                self.core.mapped_windows.remove(self)
+            self.core.mapped_windows.pop(self, None)
 
     def _on_map(self, _listener, _data):
         logger.debug("Signal: window map")
         self.mapped = True
+        self.damage()
         self.core.focus_window(self)
 
     def _on_unmap(self, _listener, _data):
         logger.debug("Signal: window unmap")
-        self.mapped = False
         self.damage()
+        self.mapped = False
         seat = self.core.seat
         if not seat.destroyed:
-            if self.surface.surface == seat.keyboard_state.focused_surface:
+            if self.surface.surface._ptr == self.core._focused_surface_ptr:
                 seat.keyboard_clear_focus()
+                self.core._focused_surface_ptr = None
 
     def _on_destroy(self, _listener, _data):
         logger.debug("Signal: window destroy")
+        if self._mapped:
+            # Clients should unmap first, but make sure we don't keep rendering it
+            self.mapped = False
+        self._cached_screen = None
         self.qtile.unmanage(self.wid)
         self.finalize()
 
     def _on_new_popup(self, _listener, xdg_popup: XdgPopup):
         logger.debug("Signal: window new_popup")
-        self.popups.append(XdgPopupWindow(self, xdg_popup))
+        self.popups.append(XdgPopupWindow.acquire(self, xdg_popup))
+
+    def find_popup_output(self, x: int, y: int) -> Tuple[float, float, Output]:
+        """
+        Find the closest point in the output layout to a popup's position, and the
+        output it is on. The result is kept for the next popup opened from the same
+        position.
+        """
+        key = (x, y)
+        if self._popup_output_cache is None or key != self._popup_output_cache_key:
+            lx, ly = self.core.output_layout.closest_point(x, y)
+            wlr_output = self.core.output_layout.output_at(lx, ly)
+            self._popup_output_cache = (lx, ly, wlr_output.data)
+            self._popup_output_cache_key = key
+        return self._popup_output_cache
 
     def _on_request_fullscreen(self, _listener, event: XdgTopLevelSetFullscreenEvent):
         logger.debug("Signal: window request_fullscreen")
@@ -161,12 +265,26 @@ class Window(base.Window, HasListeners):
             self.fullscreen = event.fullscreen
 
     def _on_commit(self, _listener, _data):
+        # Cache the committed size so that frequent width/height reads don't go
+        # through cffi each time
+        current = self.surface.surface.current
+        if current.width != self._width or current.height != self._height:
+            self._width = current.width
+            self._height = current.height
+            self._geom_dirty = True
         self.damage()
 
     def damage(self) -> None:
-        for output in self.core.outputs:
-            if output.contains(self):
-                output.damage.add_whole()
+        if not self._mapped:
+            # Unmapped clients can still commit, but there is nothing to render
+            return
+        if self._geom_dirty:
+            # Only work out which outputs we are on when our geometry or the output
+            # layout has changed since we last checked
+            self._containing_outputs = [o for o in self.core.outputs if o.contains(self)]
+            self._geom_dirty = False
+        for output in self._containing_outputs:
+            output.queue_damage()
 
     def hide(self):
         if self.mapped:
@@ -202,24 +320,34 @@ class Window(base.Window, HasListeners):
             if group is None:
                 raise CommandError("No such group: %s" % group_name)
 
-        if self.group is not group:
-            self.hide()
-            if self.group:
-                if self.group.screen:
-                    # for floats remove window offset
-                    self.x -= self.group.screen.x
-                self.group.remove(self)
-
-            if group.screen and self.x < group.screen.x:
-                self.x += group.screen.x
-            group.add(self)
-            if switch_group:
-                group.cmd_toscreen(toggle=False)
+        if group is self.group:
+            return
+
+        self.hide()
+        if self.group:
+            if self.group.screen:
+                # for floats remove window offset
+                self.x -= self.group.screen.x
+            self.group.remove(self)
+
+        if group.screen and self.x < group.screen.x:
+            self.x += group.screen.x
+        group.add(self)
+        if switch_group:
+            group.cmd_toscreen(toggle=False)
 
     def paint_borders(self, color, width) -> None:
+        if color:
+            key = color if isinstance(color, (str, ffi.CData)) else tuple(color)
+        else:
+            key = None
+        if (key, width) == self._last_border:
+            return
+
         if color:
             self.bordercolor = _rgb(color)
         self.borderwidth = width
+        self._last_border = (key, width)
 
     @property
     def floating(self):
@@ -229,13 +357,7 @@ class Window(base.Window, HasListeners):
     def floating(self, do_float):
         if do_float and self._float_state == FloatStates.NOT_FLOATING:
             if self.group and self.group.screen:
-                screen = self.group.screen
-                self._enablefloating(
-                    screen.x + self.float_x,
-                    screen.y + self.float_y,
-                    self.float_width,
-                    self.float_height
-                )
+                self._set_float_state(FloatStates.FLOATING, True, self.group.screen)
             else:
                 # if we are setting floating early, e.g. from a hook, we don't have a screen yet
                 self._float_state = FloatStates.FLOATING
@@ -254,20 +376,7 @@ class Window(base.Window, HasListeners):
 
     @fullscreen.setter
     def fullscreen(self, do_full):
-        if do_full:
-            screen = self.group.screen or \
-                self.qtile.find_closest_screen(self.x, self.y)
-            self._enablefloating(
-                screen.x,
-                screen.y,
-                screen.width,
-                screen.height,
-                new_float_state=FloatStates.FULLSCREEN
-            )
-            return
-
-        if self._float_state == FloatStates.FULLSCREEN:
-            self.floating = False
+        self._set_float_state(FloatStates.FULLSCREEN, do_full)
 
     @property
     def maximized(self):
@@ -275,20 +384,7 @@ class Window(base.Window, HasListeners):
 
     @maximized.setter
     def maximized(self, do_maximize):
-        if do_maximize:
-            screen = self.group.screen or \
-                self.qtile.find_closest_screen(self.x, self.y)
-
-            self._enablefloating(
-                screen.dx,
-                screen.dy,
-                screen.dwidth,
-                screen.dheight,
-                new_float_state=FloatStates.MAXIMIZED
-            )
-        else:
-            if self._float_state == FloatStates.MAXIMIZED:
-                self.floating = False
+        self._set_float_state(FloatStates.MAXIMIZED, do_maximize)
 
     @property
     def minimized(self):
@@ -296,12 +392,28 @@ class Window(base.Window, HasListeners):
 
     @minimized.setter
     def minimized(self, do_minimize):
-        if do_minimize:
-            if self._float_state != FloatStates.MINIMIZED:
-                self._enablefloating(new_float_state=FloatStates.MINIMIZED)
-        else:
-            if self._float_state == FloatStates.MINIMIZED:
+        self._set_float_state(FloatStates.MINIMIZED, do_minimize)
+
+    def _set_float_state(self, new_float_state, enable, screen=None):
+        """
+        Enter or leave one of the floating states. Leaving a state returns the window
+        to the layout, and entering one places it using the rect from _STATE_RECT.
+        """
+        if not enable:
+            if self._float_state == new_float_state:
                 self.floating = False
+            return
+
+        get_rect = _STATE_RECT[new_float_state]
+        if get_rect is None:
+            # This state isn't placed on a screen, so only enter it once
+            if self._float_state != new_float_state:
+                self._enablefloating(new_float_state=new_float_state)
+            return
+
+        if screen is None:
+            screen = self.group.screen or self.qtile.find_closest_screen(self.x, self.y)
+        self._enablefloating(*get_rect(screen, self), new_float_state=new_float_state)
 
     def focus(self, warp):
         self.core.focus_window(self)
@@ -328,26 +440,30 @@ class Window(base.Window, HasListeners):
         self.paint_borders(bordercolor, borderwidth)
 
         if above:
-            self.core.mapped_windows.remove(self)
-            self.core.mapped_windows.append(self)
+            self.core.mapped_windows.move_to_end(self)
 
         self.damage()
 
     def _tweak_float(self, x=None, y=None, dx=0, dy=0, w=None, h=None, dw=0, dh=0):
+        cur_x = self.x
+        cur_y = self.y
+        cur_w = self.width
+        cur_h = self.height
+
         if x is None:
-            x = self.x
+            x = cur_x
         x += dx
 
         if y is None:
-            y = self.y
+            y = cur_y
         y += dy
 
         if w is None:
-            w = self.width
+            w = cur_w
         w += dw
 
         if h is None:
-            h = self.height
+            h = cur_h
         h += dh
 
         if h < 0:
@@ -355,16 +471,32 @@ class Window(base.Window, HasListeners):
         if w < 0:
             w = 0
 
-        screen = self.qtile.find_closest_screen(
-            self.x + self.width // 2, self.y + self.height // 2
-        )
-        if self.group and screen is not None and screen != self.group.screen:
-            self.group.remove(self, force=True)
+        screen = self._find_closest_screen(cur_x + cur_w // 2, cur_y + cur_h // 2)
+        group = self.group
+        if group and screen is not None and screen != group.screen:
+            group.remove(self, force=True)
             screen.group.add(self, force=True)
             self.qtile.focus_screen(screen.index)
 
         self._reconfigure_floating(x, y, w, h)
 
+    def _find_closest_screen(self, x: int, y: int) -> Screen:
+        """
+        Find the screen closest to a point, reusing the last result while the point
+        stays inside it and the screens have not been reconfigured.
+        """
+        if self._cached_screen is not None and self._cached_screens is self.qtile.screens:
+            sx, sy, sw, sh = self._cached_screen_rect
+            if sx < x < sx + sw and sy < y < sy + sh:
+                return self._cached_screen
+
+        screen = self.qtile.find_closest_screen(x, y)
+        self._cached_screen = screen
+        self._cached_screens = self.qtile.screens
+        if screen is not None:
+            self._cached_screen_rect = (screen.x, screen.y, screen.width, screen.height)
+        return screen
+
     def _enablefloating(self, x=None, y=None, w=None, h=None,
                         new_float_state=FloatStates.FLOATING):
         self._reconfigure_floating(x, y, w, h, new_float_state)
@@ -391,18 +523,20 @@ class Window(base.Window, HasListeners):
 
     def cmd_info(self) -> Dict:
         """Return a dictionary of info."""
+        group = self.group
+        float_state = self._float_state
         return dict(
             name=self.name,
             x=self.x,
             y=self.y,
             width=self.width,
             height=self.height,
-            group=self.group.name if self.group else None,
+            group=group.name if group else None,
             id=self.wid,
-            floating=self._float_state != FloatStates.NOT_FLOATING,
-            maximized=self._float_state == FloatStates.MAXIMIZED,
-            minimized=self._float_state == FloatStates.MINIMIZED,
-            fullscreen=self._float_state == FloatStates.FULLSCREEN
+            floating=float_state != FloatStates.NOT_FLOATING,
+            maximized=float_state == FloatStates.MAXIMIZED,
+            minimized=float_state == FloatStates.MINIMIZED,
+            fullscreen=float_state == FloatStates.FULLSCREEN
         )
 
     def cmd_move_floating(self, dx: int, dy: int) -> None:
@@ -451,8 +585,7 @@ class Window(base.Window, HasListeners):
 
     def cmd_bring_to_front(self) -> None:
         if self.mapped:
-            self.core.mapped_windows.remove(self)
-            self.core.mapped_windows.append(self)
+            self.core.mapped_windows.move_to_end(self)
 
     def cmd_kill(self) -> None:
         self.kill()
@@ -465,8 +598,23 @@ class Internal(Window, base.Internal):
 class Static(Window, base.Static):
     """
     Static windows represent both regular windows made static by the user and layer
-    surfaces created as part of the wlr layer shell protocol.
+    surfaces created as part of the wlr layer shell protocol. Creating a Static gives
+    an instance of the subclass that handles the given type of surface.
     """
+    __slots__ = ()
+    _LISTENERS = (
+        ("map_event", "_on_map"),
+        ("unmap_event", "_on_unmap"),
+        ("destroy_event", "_on_destroy"),
+        ("surface.commit_event", "_on_commit"),
+    )
+    is_layer: bool
+
+    def __new__(cls, core: Core, qtile: Qtile, surface: SurfaceType, wid: int) -> Static:
+        if cls is Static:
+            cls = _StaticLayer if isinstance(surface, LayerSurfaceV1) else _StaticXdg
+        return super().__new__(cls)
+
     def __init__(
         self,
         core: Core,
@@ -481,26 +629,72 @@ class Static(Window, base.Static):
         self.surface = surface
         self._wid = wid
         self._mapped: bool = False
+        self._containing_outputs: List[Output] = []
+        self._geom_dirty = True
         self.x = 0
         self.y = 0
+        self._width: int = 0
+        self._height: int = 0
         self.borderwidth: int = 0
-        self.bordercolor: ffi.CData = _rgb((0, 0, 0, 1))
+        self.bordercolor: ffi.CData = _BLACK
+        self._last_border: Optional[Tuple] = None
         self.opacity: float = 1.0
         self._float_state = FloatStates.FLOATING
+        self._cached_screen = None
+        self._cached_screen_rect = (0, 0, 0, 0)
+        self._cached_screens = None
+        self._popup_output_cache = None
+        self._popup_output_cache_key = None
         self.defunct = True
-        self.is_layer = False
 
-        self.add_listener(surface.map_event, self._on_map)
-        self.add_listener(surface.unmap_event, self._on_unmap)
-        self.add_listener(surface.destroy_event, self._on_destroy)
-        self.add_listener(surface.surface.commit_event, self._on_commit)
+        self.add_listeners(surface, self._LISTENERS)
 
-        if isinstance(surface, LayerSurfaceV1):
-            self.is_layer = True
-            if surface.output is None:
-                surface.output = core.output_layout.output_at(core.cursor.x, core.cursor.y)
-            self.output = core.output_from_wlr_output(surface.output)
-            self.mapped = True
+    def _on_map(self, _listener, data):
+        logger.debug("Signal: window map")
+        self.mapped = True
+        self.damage()
+
+    def _on_unmap(self, _listener, data):
+        logger.debug("Signal: window unmap")
+        self.damage()
+        self.mapped = False
+        if self.surface.surface._ptr == self.core._focused_surface_ptr:
+            self.core.seat.keyboard_clear_focus()
+            self.core._focused_surface_ptr = None
+
+
+class _StaticXdg(Static):
+    """A regular XdgSurface window that has been made static."""
+    __slots__ = ()
+    is_layer = False
+
+    def place(self, x, y, width, height, borderwidth, bordercolor,
+              above=False, margin=None, respect_hints=False):
+        self.x = x
+        self.y = y
+        self.surface.set_size(int(width), int(height))
+        self.paint_borders(bordercolor, borderwidth)
+        self.damage()
+
+
+class _StaticLayer(Static):
+    """A layer shell surface, which is placed and stacked by its output."""
+    __slots__ = ("output",)
+    is_layer = True
+
+    def __init__(
+        self,
+        core: Core,
+        qtile: Qtile,
+        surface: SurfaceType,
+        wid: int,
+    ):
+        Static.__init__(self, core, qtile, surface, wid)
+        assert isinstance(surface, LayerSurfaceV1)
+        if surface.output is None:
+            surface.output = core.output_layout.output_at(core.cursor.x, core.cursor.y)
+        self.output = core.output_from_wlr_output(surface.output)
+        self.mapped = True
 
     @property
     def mapped(self) -> bool:
@@ -511,68 +705,47 @@ class Static(Window, base.Static):
     @mapped.setter
     def mapped(self, mapped: bool) -> None:
         self._mapped = mapped
+        self._geom_dirty = True
 
-        tracker: List  # mypy complains as the signatures of the two possibilities differ
-        if self.is_layer:
-            tracker = self.output.layers[self.surface.client_pending.layer]  # type: ignore
-        else:
-            tracker = self.core.mapped_windows
-
+        tracker = self.output.layers[self.surface.client_pending.layer]  # type: ignore
         if mapped:
-            if self not in tracker:
-                tracker.append(self)
+            tracker[self] = None
         else:
-            if self in tracker:
-                tracker.remove(self)
+            tracker.pop(self, None)
 
-        if self.is_layer:
-            self.output.organise_layers()
+        self.output.organise_layers()
 
     def _on_map(self, _listener, data):
-        logger.debug("Signal: window map")
-        self.mapped = True
-        self.damage()
-        if self.is_layer:
-            self.output.organise_layers()
+        Static._on_map(self, _listener, data)
+        self.output.organise_layers()
 
     def _on_unmap(self, _listener, data):
-        logger.debug("Signal: window unmap")
-        self.mapped = False
-        if self.surface.surface == self.core.seat.keyboard_state.focused_surface:
-            self.core.seat.keyboard_clear_focus()
-        if self.is_layer:
-            self.output.organise_layers()
-        self.damage()
+        Static._on_unmap(self, _listener, data)
+        self.output.organise_layers()
 
     def kill(self):
-        if self.is_layer:
-            self.surface.close()
-        else:
-            self.surface.send_close()
+        self.surface.close()
 
     def damage(self) -> None:
-        if self.is_layer:
-            self.output.damage.add_whole()
-        else:
-            for output in self.core.outputs:
-                if output.contains(self):
-                    output.damage.add_whole()
+        if self._mapped:
+            self.output.queue_damage()
 
     def place(self, x, y, width, height, borderwidth, bordercolor,
               above=False, margin=None, respect_hints=False):
         self.x = x
         self.y = y
-        if self.is_layer:
-            self.surface.configure(width, height)
-        else:
-            self.surface.set_size(int(width), int(height))
-            self.paint_borders(bordercolor, borderwidth)
+        self.surface.configure(width, height)
         self.damage()
 
 
 WindowType = typing.Union[Window, Internal, Static]
 
 
+# Destroyed popups are kept here to be reused by new ones
+_POPUP_POOL: List[XdgPopupWindow] = []
+_POPUP_POOL_MAX = 32
+
+
 class XdgPopupWindow(HasListeners):
     """
     This represents a single `struct wlr_xdg_popup` object and is owned by a single
@@ -580,11 +753,45 @@ class XdgPopupWindow(HasListeners):
     work for us, but we need to listen to certain events so that we know when to render
     frames and we need to unconstrain the popups so they are completely visible.
     """
+    __slots__ = ("parent", "xdg_popup", "core", "popups", "output", "output_box")
+    _LISTENERS = (
+        ("map_event", "_on_map"),
+        ("unmap_event", "_on_unmap"),
+        ("destroy_event", "_on_destroy"),
+        ("new_popup_event", "_on_new_popup"),
+        ("surface.commit_event", "_on_commit"),
+    )
+
     def __init__(self, parent: Union[WindowType, XdgPopupWindow], xdg_popup: XdgPopup):
+        self.popups: List[XdgPopupWindow] = []
+        self._listeners = []
+        self._reinit(parent, xdg_popup)
+
+    @classmethod
+    def acquire(
+        cls, parent: Union[WindowType, XdgPopupWindow], xdg_popup: XdgPopup
+    ) -> XdgPopupWindow:
+        """Get a popup for the given `struct wlr_xdg_popup`, reusing a released one if possible"""
+        if _POPUP_POOL:
+            popup = _POPUP_POOL.pop()
+            popup._reinit(parent, xdg_popup)
+            return popup
+        return cls(parent, xdg_popup)
+
+    def _release(self) -> None:
+        """Drop references to the destroyed popup's objects and return it to the pool"""
+        siblings = self.parent.popups
+        if self in siblings:
+            siblings.remove(self)
+        self.popups.clear()
+        del self.parent, self.xdg_popup, self.core, self.output, self.output_box
+        if len(_POPUP_POOL) < _POPUP_POOL_MAX:
+            _POPUP_POOL.append(self)
+
+    def _reinit(self, parent: Union[WindowType, XdgPopupWindow], xdg_popup: XdgPopup) -> None:
         self.parent = parent
         self.xdg_popup = xdg_popup
         self.core: Core = parent.core
-        self.popups: List[XdgPopupWindow] = []
 
         # Keep on output
         if isinstance(parent, XdgPopupWindow):
@@ -594,37 +801,32 @@ class XdgPopupWindow(HasListeners):
         else:
             # Parent is an XdgSurface; This is a first-level XdgPopup
             box = xdg_popup.base.get_geometry()
-            lx, ly = self.core.output_layout.closest_point(parent.x + box.x, parent.y + box.y)
-            wlr_output = self.core.output_layout.output_at(lx, ly)
-            self.output = wlr_output.data
+            lx, ly, self.output = parent.find_popup_output(parent.x + box.x, parent.y + box.y)
             box = Box(*self.output.get_geometry())
             box.x = round(box.x - lx)
             box.y = round(box.y - ly)
             self.output_box = box
         xdg_popup.unconstrain_from_box(self.output_box)
 
-        self.add_listener(xdg_popup.base.map_event, self._on_map)
-        self.add_listener(xdg_popup.base.unmap_event, self._on_unmap)
-        self.add_listener(xdg_popup.base.destroy_event, self._on_destroy)
-        self.add_listener(xdg_popup.base.new_popup_event, self._on_new_popup)
-        self.add_listener(xdg_popup.base.surface.commit_event, self._on_commit)
+        self.add_listeners(xdg_popup.base, self._LISTENERS)
 
     def _on_map(self, _listener, _data):
         logger.debug("Signal: popup map")
-        self.output.damage.add_whole()
+        self.output.queue_damage()
 
     def _on_unmap(self, _listener, _data):
         logger.debug("Signal: popup unmap")
-        self.output.damage.add_whole()
+        self.output.queue_damage()
 
     def _on_destroy(self, _listener, _data):
         logger.debug("Signal: popup destroy")
         self.finalize_listeners()
-        self.output.damage.add_whole()
+        self.output.queue_damage()
+        self._release()
 
     def _on_new_popup(self, _listener, xdg_popup: XdgPopup):
         logger.debug("Signal: popup new_popup")
-        self.popups.append(XdgPopupWindow(self, xdg_popup))
+        self.popups.append(XdgPopupWindow.acquire(self, xdg_popup))
 
     def _on_commit(self, _listener, _data):
-        self.output.damage.add_whole()
+        self.output.queue_damage()
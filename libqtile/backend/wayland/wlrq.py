@@ -32,7 +32,7 @@ from wlroots.wlr_types.keyboard import KeyboardModifier
 from libqtile.log_utils import logger
 
 if TYPE_CHECKING:
-    from typing import Callable, List
+    from typing import Callable, List, Tuple
 
     from pywayland.server import Signal
 
@@ -139,6 +139,8 @@ class HasListeners:
 
     This guarantees that all listeners that set up and then removed in reverse order.
     """
+    __slots__ = ("_listeners",)
+
     def add_listener(self, event: Signal, callback: Callable):
         if not hasattr(self, "_listeners"):
             self._listeners = []
@@ -146,6 +148,17 @@ class HasListeners:
         event.add(listener)
         self._listeners.append(listener)
 
+    def add_listeners(self, source, listeners: Tuple[Tuple[str, str], ...]):
+        """
+        Add a listener for each pair of dotted signal attribute of `source` and name of
+        the callback method on `self`.
+        """
+        for event_name, callback_name in listeners:
+            signal = operator.attrgetter(event_name)(source)
+            self.add_listener(signal, getattr(self, callback_name))
+
     def finalize_listeners(self):
         for listener in reversed(self._listeners):
             listener.remove()
+        # The listeners hold bound methods, so drop them to break the reference cycle
+        self._listeners.clear()